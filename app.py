@@ -1,6 +1,8 @@
 # Binance paper trading app so you can trade on paper and not lose real money
 
+import asyncio
 import logging
+import time
 from textual.app import App, ComposeResult
 from textual.containers import Vertical, Horizontal, VerticalScroll
 from ui import PriceDisplay, OrderForm, PositionTable, HistoryTable, OrderTable
@@ -9,8 +11,12 @@ from textual.widgets import DataTable, TabbedContent, TabPane
 from textual.widgets import Select, Input
 from ui.limit_dialog import LimitDialog
 from textual import events
+from textual.timer import Timer
 from trades_service import TradesService
 
+# Upper bound for the extra delay added between price refreshes under backpressure
+MAX_FETCH_BACKOFF = 8.0
+
 class BinancePriceApp(App):
     CSS_PATH = "app.tcss"
     SCREENS = {"limit": LimitDialog}
@@ -21,6 +27,16 @@ class BinancePriceApp(App):
         self.price_widget = PriceDisplay()
         self.order_form = OrderForm()
         self.fetch_interval = fetch_interval
+        # Backpressure state for the periodic price refresh
+        self._fetch_in_flight = False
+        self._slow_fetches = 0
+        self._fetch_backoff = 0.0
+        self._fetch_not_before = 0.0
+        # Tables ("positions", "orders", "history") waiting for the next coalesced redraw
+        self._dirty_tables: set[str] = set()
+        self._flush_timer: Timer | None = None
+        # (orders, positions) counts currently shown in the tab labels
+        self._tab_counts: tuple[int, int] | None = None
 
     def compose(self) -> ComposeResult:
         # Instantiate tables here so they are created within an active App context
@@ -55,14 +71,36 @@ class BinancePriceApp(App):
     async def on_mount(self) -> None:
         # Update history table with loaded trades
         self.history_table.update_history(self.trades.get_history())
-        # Fetch symbols asynchronously
-        await self.fetch_symbols()
+        # Open the price stream in the background: connecting blocks a worker thread for as
+        # long as the handshake takes and must not hold up the App's message handlers
+        self._restream_prices()
+        # Fetch symbols, the first prices and the default symbol's fees concurrently; each
+        # handles its own errors
+        await asyncio.gather(
+            self.fetch_symbols(),
+            self.fetch_and_update(),
+            self.trades.warm_up(),
+            return_exceptions=True,
+        )
         # refresh symbol list every 10 minutes in background
         self.set_interval(600, self.fetch_symbols, pause=False)
-        await self.fetch_and_update()
         self.set_interval(self.fetch_interval, self.fetch_and_update)
         # initialize orders tab reference after layout is mounted
-        self._refresh_orders_tab_label()
+        self._refresh_orders_tab_label(self.trades.order_count(), self.trades.position_count())
+
+    def on_unmount(self) -> None:
+        self.trades.close()
+
+    def _restream_prices(self) -> None:
+        """Re-point the price stream at the current symbol without waiting for it."""
+        self.run_worker(self._stream_prices(), group="price_stream")
+
+    async def _stream_prices(self) -> None:
+        """Point the websocket price stream at the current symbol; REST polling covers failures."""
+        try:
+            await self.trades.stream_current_prices()
+        except Exception as exc:
+            self.log(f"Price stream unavailable, polling REST instead: {exc}", level="error")
 
     async def fetch_symbols(self) -> None:
         """Retrieve top USDT pairs and update dropdown. Retry on errors."""
@@ -76,9 +114,11 @@ class BinancePriceApp(App):
             if current_symbol not in symbols:
                 self.trades.set_current_symbol(symbols[0])
                 current_symbol = symbols[0]
+                self.order_form.set_mark_price(None)
 
-            # Update the symbols in the order form
-            self.order_form.update_symbols(symbols, current_symbol)
+            # Update the symbols in the order form (a no-op when nothing changed)
+            if not self.order_form.update_symbols(symbols, current_symbol):
+                return
             self.order_form.set_coin_label_from_symbol(current_symbol)
             self.log(f"Symbol list updated (count={len(symbols)})", level="info")
 
@@ -86,85 +126,107 @@ class BinancePriceApp(App):
             self.log(f"Failed to fetch symbols: {exc}", level="error")
 
     async def fetch_and_update(self) -> None:
+        # Coalesce ticks while a fetch is still running or while backing off
+        if self._fetch_in_flight or time.monotonic() < self._fetch_not_before:
+            return
+        self._fetch_in_flight = True
+        started = time.monotonic()
         try:
             last, mark = await self.trades.get_current_prices()
-            self.price_widget.update_prices(last, mark)
 
+            # Parse once per tick; the price widget and everything below reuse the floats
             try:
                 mark_f = float(mark)
                 last_f = float(last)
             except ValueError:
                 mark_f = None
                 last_f = None
+            self.price_widget.update_prices(last, mark, last_f, mark_f)
 
             # Check and fill limit orders if we have a valid last price
+            filled_orders = []
+            history_changed = False
+            positions_changed = False
             if last_f is not None:
                 filled_orders = await self.trades.check_and_fill_limit_orders(last_f)
+                positions_changed = bool(filled_orders)
                 for order in filled_orders:
                     if "position_id" in order:
+                        history_changed = True
                         self.log(f"Position {order['position_id']} closed via limit order")
                     else:
                         self.log(f"Limit order filled -> active position {order['id']}")
 
-            # Update PnL for open positions if we have a valid mark price
+            # USDT order sizing uses this tick's mark, or none at all if it was not a number
+            self.order_form.set_mark_price(mark_f)
+            # Update PnL for open positions if we have a valid mark price (skipped when unchanged)
             if mark_f is not None:
-                await self.trades.update_positions_pnl(mark_f)
-
-            # Update all UI tables
-            self.position_table.update_positions(self.trades.get_positions())
-            self.order_table.update_orders(self.trades.get_orders())
-            self.history_table.update_history(self.trades.get_history())
-            self._refresh_orders_tab_label()
+                if await self.trades.update_positions_pnl(mark_f):
+                    positions_changed = True
+
+            # Redraw each table at most once, and only the ones this tick changed:
+            # orders only change on fills, history only when a fill closed a position
+            if filled_orders:
+                self._dirty_tables.add("orders")
+            if positions_changed:
+                self._dirty_tables.add("positions")
+            if history_changed:
+                self._dirty_tables.add("history")
+            self._flush_tables()
 
         except Exception as exc:
             self.log(f"Error fetching prices: {exc}", level="error")
-            self.price_widget.update_prices("n/a", "n/a")
+            self.price_widget.update_prices("n/a", "n/a", None, None)
+            # Don't size USDT orders from a mark we could not refresh
+            self.order_form.set_mark_price(None)
+        finally:
+            self._fetch_in_flight = False
+            self._adapt_fetch_backoff(time.monotonic() - started)
+
+    def _adapt_fetch_backoff(self, elapsed: float) -> None:
+        """Slow the price refresh down while fetches take longer than the interval.
+
+        More than 3 consecutive slow fetches double the backoff delay; a fetch that
+        completes in under half the interval clears it again.
+        """
+        if elapsed > self.fetch_interval:
+            self._slow_fetches += 1
+            if self._slow_fetches > 3:
+                self._slow_fetches = 0
+                self._fetch_backoff = min(max(self._fetch_backoff * 2, self.fetch_interval), MAX_FETCH_BACKOFF)
+                self.log(f"Price refresh falling behind, backing off {self._fetch_backoff:.1f}s", level="warning")
+        else:
+            self._slow_fetches = 0
+            if self._fetch_backoff and elapsed < self.fetch_interval / 2:
+                self._fetch_backoff = 0.0
+                self.log("Price refresh caught up, backoff cleared", level="info")
+        self._fetch_not_before = time.monotonic() + self._fetch_backoff
 
     @on(OrderForm.Submit)
     async def order_submitted(self, message: OrderForm.Submit) -> None:
         """Handle order form submissions."""
         try:
             symbol = message.symbol or self.trades.get_current_symbol()
-            price = float(message.price) if message.price is not None else None
-            
-            # If price is None (market order) and qty_mode is USDT, we need a price to convert
-            if price is None and message.qty_mode == "USDT":
-                # Fetch current mark price to estimate size
-                _, mark = await self.trades.get_current_prices()
-                try:
-                    price = float(mark)
-                except ValueError:
-                    self.log("Invalid mark price; cannot determine size for USDT qty", level="error")
-                    return
-            
-            # Convert quantity to size based on qty_mode
-            qty_value = float(message.qty)
-            if message.qty_mode == "USDT":
-                size = qty_value / price if price else 0.0
-            else:
-                size = qty_value
 
             if message.price is not None:
                 # This is a limit order
                 order = self.trades.submit_limit_order(
                     symbol=symbol,
                     side=message.side,
-                    size=size,
-                    limit_price=price
+                    size=message.size,
+                    limit_price=message.price
                 )
                 self.log(f"New limit order placed: {order['id']}")
-                self.order_table.update_orders(self.trades.get_orders())
-                self._refresh_orders_tab_label()
+                self._mark_dirty("orders")
             else:
                 # This is a market order
                 position = await self.trades.submit_market_order(
                     symbol=symbol,
                     side=message.side,
-                    size=size,
-                    price=price
+                    size=message.size,
                 )
-                self.log(f"New {message.side} position opened: {position['id']}")
-                self.position_table.update_positions(self.trades.get_positions())
+                self.log(f"New {message.side} position opened: {position.id}")
+                self._mark_dirty("positions")
 
         except Exception as exc:
             self.log(f"Failed to submit order: {exc}", level="error")
@@ -172,31 +234,30 @@ class BinancePriceApp(App):
     @on(DataTable.CellSelected)
     async def position_table_cell_selected(self, event: DataTable.CellSelected) -> None:
         """Handle position table cell selection."""
+        # Both CellSelected handlers see clicks from every table; only handle our own
+        if event.data_table is not self.position_table:
+            return
         cell_value = event.value
         if cell_value not in ("Close", "Limit"):
             return
 
         # Get position details from the table
         row_key = event.cell_key.row_key.value
-        pos = next((p for p in self.trades.get_positions() if p["id"] == row_key), None)
+        pos = self.trades.get_position(row_key)
         if not pos:
             return
 
         if cell_value == "Close":
             # Close at market price
-            closed = await self.trades.close_position_market(pos["id"])
+            closed = await self.trades.close_position_market(pos.id)
             if closed:
-                self.log(f"Closed position {pos['id']} at market. Net PnL {closed['net_pnl']}")
-                # Refresh tables
-                self.position_table.update_positions(self.trades.get_positions())
-                self.history_table.update_history(self.trades.get_history())
-                # Also refresh orders table in case linked exit orders were removed
-                self.order_table.update_orders(self.trades.get_orders())
-                self._refresh_orders_tab_label()
+                self.log(f"Closed position {pos.id} at market. Net PnL {closed['net_pnl']}")
+                # Refresh tables, including orders in case linked exit orders were removed
+                self._mark_dirty("positions", "history", "orders")
         else:  # Limit
             # Show limit order dialog
-            limit_dialog = LimitDialog(pos["id"])
-            async def _limit_callback(result: float | None, position_id: str = pos["id"]) -> None:
+            limit_dialog = LimitDialog(pos.id)
+            async def _limit_callback(result: float | None, position_id: str = pos.id) -> None:
                 self._process_limit_result(position_id, result)
 
             # Push screen and wait for it to mount; result will be handled in callback
@@ -209,13 +270,40 @@ class BinancePriceApp(App):
         if not isinstance(event.value, str) or event.value == "":
             return
 
+        if event.value != self.trades.get_current_symbol():
+            # The last mark belongs to the previous symbol; USDT sizing waits for the next tick.
+            # Re-selecting the current symbol (e.g. when the list is refreshed) keeps it.
+            self.order_form.set_mark_price(None)
         self.trades.set_current_symbol(event.value)
         self.order_form.set_coin_label_from_symbol(event.value)
+        self._restream_prices()
+
+    def _mark_dirty(self, *tables: str) -> None:
+        """Queue *tables* for a redraw, coalescing changes that land within 50 ms."""
+        self._dirty_tables.update(tables)
+        if self._flush_timer is None:
+            self._flush_timer = self.set_timer(0.05, self._flush_tables)
+
+    def _flush_tables(self) -> None:
+        """Redraw each table queued since the last flush exactly once."""
+        self._flush_timer = None
+        if not self._dirty_tables:
+            return
+        dirty, self._dirty_tables = self._dirty_tables, set()
 
-    def _refresh_orders_tab_label(self):
+        if "positions" in dirty:
+            self.position_table.update_positions(self.trades.get_positions())
+        if "orders" in dirty:
+            self.order_table.update_orders(self.trades.get_orders())
+        if "history" in dirty:
+            self.history_table.update_history(self.trades.get_history())
+        # Tab labels are only relabelled when a count moved
+        counts = (self.trades.order_count(), self.trades.position_count())
+        if counts != self._tab_counts:
+            self._refresh_orders_tab_label(*counts)
+
+    def _refresh_orders_tab_label(self, orders_count: int, positions_count: int) -> None:
         """Update tab labels with counts for Orders and Active (positions)."""
-        orders_count = len(self.trades.get_orders())
-        positions_count = len(self.trades.get_positions())
         try:
             from textual.widgets._tabbed_content import ContentTabs
 
@@ -230,39 +318,40 @@ class BinancePriceApp(App):
             active_tab.label = (
                 f"Active ({positions_count})" if positions_count else "Active"
             )
+            self._tab_counts = (orders_count, positions_count)
         except Exception as exc:
             self.log(f"Failed to update tab labels: {exc}", level="error")
 
     @on(DataTable.CellSelected)
     def order_table_cell_selected(self, event: DataTable.CellSelected) -> None:
         """Handle order table cell selection."""
+        if event.data_table is not self.order_table:
+            return
         if event.value == "Cancel":
             # Get order details from the table
             row_key = event.cell_key.row_key.value
             self.trades.cancel_order(row_key)
-            self.order_table.update_orders(self.trades.get_orders())
-            self._refresh_orders_tab_label()
+            self._mark_dirty("orders")
 
     def _process_limit_result(self, position_id: str, price: float | None) -> None:
         """Process the result of a limit order dialog."""
         if price is None:
             return
 
-        pos = next((p for p in self.trades.get_positions() if p["id"] == position_id), None)
+        pos = self.trades.get_position(position_id)
         if not pos:
             return
 
         # Create exit limit order
         order = self.trades.submit_limit_order(
-            symbol=pos["symbol"],
-            side="SELL" if pos["side"] == "BUY" else "BUY",
-            size=pos["size"],
+            symbol=pos.symbol,
+            side="SELL" if pos.side == "BUY" else "BUY",
+            size=pos.size,
             limit_price=price,
             position_id=position_id
         )
 
-        self.order_table.update_orders(self.trades.get_orders())
-        self._refresh_orders_tab_label()
+        self._mark_dirty("orders")
         self.log(f"Exit limit order created for position {position_id}")
 
     @on(events.ScreenResume)
@@ -1,5 +1,25 @@
 import asyncio
+import threading
+import time
+from itertools import islice
+import orjson
 from binance.um_futures import UMFutures
+from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+
+# How long a downloaded exchangeInfo payload is reused (seconds). Kept well below the app's
+# 600 s symbol poll so every poll sees a fresh download.
+EXCHANGE_INFO_TTL = 300.0
+# Streamed prices are trusted while a mark price update arrived within this window (seconds)
+STREAM_STALE_AFTER = 5.0
+# Minimum delay between attempts to reopen a dropped price stream (seconds)
+STREAM_RETRY_INTERVAL = 30.0
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """Make ``response.json()`` decode with orjson instead of the stdlib json module."""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
 
 class BinanceService:
     """
@@ -7,31 +27,200 @@ class BinanceService:
     """
     def __init__(self):
         self.client = UMFutures()
+        self.client.session.hooks["response"].append(_orjson_response_hook)
         # Cache for commission lookups to avoid repeated network calls
         self._commission_cache: dict[str, tuple[float, float]] = {}
+        # REST price fetches currently running, by symbol
+        self._prices_inflight: dict[str, asyncio.Future[tuple[str, str]]] = {}
+        # Commission lookups currently running, by symbol
+        self._commission_inflight: dict[str, asyncio.Future[tuple[float, float]]] = {}
+        # (fetched_at, payload) of the last exchangeInfo download, shared by symbol and commission lookups
+        self._exchange_info_cache: tuple[float, dict] | None = None
+        # exchangeInfo download currently running, shared by concurrent callers
+        self._exchange_info_inflight: asyncio.Future[dict] | None = None
+        # Websocket price stream for a single symbol; updated from the socket thread
+        self._ws_client: UMFuturesWebsocketClient | None = None
+        self._stream_symbol: str | None = None
+        self._stream_last: str | None = None
+        self._stream_mark: tuple[float, str] | None = None  # (received_at, mark_price)
+        self._stream_retry_at = 0.0
+        # Serialises stream_prices so concurrent callers never open a second websocket
+        self._stream_lock = asyncio.Lock()
+        self._closed = False  # set by close(); no websocket may be opened afterwards
+        # Guards _closed and _ws_client between close(), worker threads and socket callbacks
+        self._ws_lock = threading.Lock()
 
     async def get_symbol_prices(self, symbol: str) -> tuple[str, str]:
         """
         fetch last traded price and mark price for the given symbol
         returns (last_price, mark_price)
+
+        served from the websocket stream when it is live for *symbol*, otherwise via REST
         """
-        # run blocking calls in threads
-        ticker = await asyncio.to_thread(self.client.ticker_price, symbol=symbol)
-        mark   = await asyncio.to_thread(self.client.mark_price, symbol=symbol)
+        if symbol == self._stream_symbol:
+            streamed = self._streamed_prices()
+            if streamed:
+                return streamed
+            if (
+                self._ws_client is None
+                and not self._stream_lock.locked()
+                and time.monotonic() >= self._stream_retry_at
+            ):
+                # Stream dropped; try to reopen it and use REST for this call
+                try:
+                    await self.stream_prices(symbol)
+                except Exception:
+                    pass
+
+        # Concurrent callers for the same symbol share a single REST round trip
+        fetch = self._prices_inflight.get(symbol)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_symbol_prices(symbol))
+            self._prices_inflight[symbol] = fetch
+            fetch.add_done_callback(lambda _: self._prices_inflight.pop(symbol, None))
+        return await asyncio.shield(fetch)
+
+    async def _fetch_symbol_prices(self, symbol: str) -> tuple[str, str]:
+        """Fetch (last_price, mark_price) for *symbol* over REST."""
+        # run blocking calls in threads, both requests in flight at once
+        ticker, mark = await asyncio.gather(
+            asyncio.to_thread(self.client.ticker_price, symbol=symbol),
+            asyncio.to_thread(self.client.mark_price, symbol=symbol),
+        )
         last_price = ticker.get("price", "n/a")
         mark_price = mark.get("markPrice", "n/a")
         return last_price, mark_price
 
+    async def stream_prices(self, symbol: str) -> None:
+        """Subscribe to pushed last-trade and mark prices for *symbol*.
+
+        Replaces any previous subscription, opening the websocket on first use.
+        Opening attempts are at least STREAM_RETRY_INTERVAL apart; within that window
+        only the wanted symbol is recorded and get_symbol_prices reopens the stream later.
+        """
+        async with self._stream_lock:
+            if self._closed:
+                return
+            if self._ws_client is None:
+                self._stream_symbol = symbol
+                self._stream_last = None
+                self._stream_mark = None
+                now = time.monotonic()
+                if now < self._stream_retry_at:
+                    return
+                self._stream_retry_at = now + STREAM_RETRY_INTERVAL
+            await asyncio.to_thread(self._subscribe_prices, symbol)
+
+    def _subscribe_prices(self, symbol: str) -> None:
+        """Blocking helper that (re)opens the websocket and swaps the subscribed symbol."""
+        ws_client = self._ws_client
+        if ws_client is None:
+            ws_client = UMFuturesWebsocketClient(
+                on_message=self._on_stream_message,
+                on_close=self._on_stream_closed,
+                on_error=self._on_stream_closed,
+            )
+            with self._ws_lock:
+                closed = self._closed
+                if not closed:
+                    self._ws_client = ws_client
+            if closed:
+                # close() ran while this client was connecting; don't leave its reader thread behind
+                self._close_ws_client(ws_client)
+                return
+        elif self._stream_symbol == symbol:
+            return
+        elif self._stream_symbol:
+            ws_client.agg_trade(symbol=self._stream_symbol, action=UMFuturesWebsocketClient.ACTION_UNSUBSCRIBE)
+            ws_client.mark_price(
+                symbol=self._stream_symbol, speed=1, action=UMFuturesWebsocketClient.ACTION_UNSUBSCRIBE
+            )
+
+        self._stream_symbol = symbol
+        self._stream_last = None
+        self._stream_mark = None
+        ws_client.agg_trade(symbol=symbol)
+        ws_client.mark_price(symbol=symbol, speed=1)
+
+    def _on_stream_message(self, _, message: str) -> None:
+        """Socket-thread callback: remember the latest trade / mark price for the subscribed symbol."""
+        try:
+            data = orjson.loads(message)
+            if not isinstance(data, dict) or data.get("s") != self._stream_symbol:
+                return  # subscription acks or late messages for a previous symbol
+            if data.get("e") == "aggTrade":
+                self._stream_last = data["p"]
+            elif data.get("e") == "markPriceUpdate":
+                self._stream_mark = (time.monotonic(), data["p"])
+        except (ValueError, KeyError):
+            # Ignore malformed frames; raising here would be reported as a socket error
+            pass
+
+    def _on_stream_closed(self, socket_manager, *_) -> None:
+        """Socket-thread callback: forget the dropped connection so REST takes over."""
+        with self._ws_lock:
+            ws_client = self._ws_client
+            if ws_client is not None and ws_client.socket_manager is socket_manager:
+                self._ws_client = None
+
+    def _streamed_prices(self) -> tuple[str, str] | None:
+        """Return streamed (last_price, mark_price) if the stream is live, else None."""
+        last, mark = self._stream_last, self._stream_mark
+        if last is None or mark is None or time.monotonic() - mark[0] > STREAM_STALE_AFTER:
+            return None
+        return last, mark[1]
+
+    def close(self) -> None:
+        """Close the price stream, if one is open."""
+        with self._ws_lock:
+            self._closed = True
+            ws_client, self._ws_client = self._ws_client, None
+        if ws_client is not None:
+            self._close_ws_client(ws_client)
+
+    @staticmethod
+    def _close_ws_client(ws_client: UMFuturesWebsocketClient) -> None:
+        """Close *ws_client* and wait briefly for its (non-daemon) reader thread to exit."""
+        socket_manager = ws_client.socket_manager
+        socket_manager.close()
+        socket_manager.join(timeout=2)
+        if socket_manager.is_alive():
+            # No close frame came back; drop the socket so the reader thread exits
+            socket_manager.ws.shutdown()
+
     async def get_top_usdt_pairs(self, limit: int = 20) -> list[str]:
         """Return USDT-margined perpetual futures symbols (up to *limit*)."""
         # Retrieve exchange info which lists all futures symbols
-        exchange_info = await asyncio.to_thread(self._get_exchange_info)
+        exchange_info = await self._get_exchange_info()
         symbols_info: list[dict] = exchange_info.get("symbols", [])
-        usdt_pairs = [s["symbol"] for s in symbols_info if s.get("quoteAsset") == "USDT" and s.get("contractType") == "PERPETUAL"]
-        # limit result
-        return usdt_pairs[:limit]
+        usdt_pairs = (s["symbol"] for s in symbols_info if s.get("quoteAsset") == "USDT" and s.get("contractType") == "PERPETUAL")
+        # limit result, stop scanning once *limit* pairs were found
+        return list(islice(usdt_pairs, limit))
+
+    async def _get_exchange_info(self) -> dict:
+        """Return futures exchange info, reusing a download younger than EXCHANGE_INFO_TTL."""
+        cached = self._exchange_info_cache
+        if cached and time.monotonic() - cached[0] < EXCHANGE_INFO_TTL:
+            return cached[1]
+
+        # Symbol and commission lookups at startup would otherwise download it twice
+        download = self._exchange_info_inflight
+        if download is None:
+            download = asyncio.ensure_future(self._download_exchange_info())
+            self._exchange_info_inflight = download
+        return await asyncio.shield(download)
 
-    def _get_exchange_info(self) -> dict:
+    async def _download_exchange_info(self) -> dict:
+        """Download exchangeInfo in a thread and cache a non-empty payload."""
+        try:
+            exchange_info = await asyncio.to_thread(self._fetch_exchange_info)
+            if exchange_info:
+                self._exchange_info_cache = (time.monotonic(), exchange_info)
+            return exchange_info
+        finally:
+            self._exchange_info_inflight = None
+
+    def _fetch_exchange_info(self) -> dict:
         """Blocking helper to get futures exchange info using whatever method is available in the client."""
         # The python-binance futures client may expose .exchange_info() or .futures_exchange_info()
         if hasattr(self.client, "futures_exchange_info"):
@@ -58,11 +247,22 @@ class BinanceService:
         if cached:
             return cached
 
+        # Concurrent callers for the same symbol share a single lookup
+        lookup = self._commission_inflight.get(symbol)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._load_commission_rates(symbol))
+            self._commission_inflight[symbol] = lookup
+            lookup.add_done_callback(lambda _: self._commission_inflight.pop(symbol, None))
+        # Shielded so a cancelled caller does not cancel the lookup for the others
+        return await asyncio.shield(lookup)
+
+    async def _load_commission_rates(self, symbol: str) -> tuple[float, float]:
+        """Look up and cache commission rates for *symbol*; never raises."""
         maker: float | None = None
         taker: float | None = None
 
         try:
-            exchange_info = await asyncio.to_thread(self._get_exchange_info)
+            exchange_info = await self._get_exchange_info()
             for s in exchange_info.get("symbols", []):
                 if s.get("symbol") == symbol:
                     # Spot API returns integers like 15 ( =0.15% ). Futures has similar.
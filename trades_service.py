@@ -1,15 +1,78 @@
+import asyncio
+import random
 import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
+import numpy as np
+from sortedcontainers import SortedDict
 from binance_service import BinanceService
-import secrets
+
+# Open-position count from which the PnL kernel runs in a worker thread instead of the event loop
+PNL_THREAD_THRESHOLD = 512
+# Smallest capacity the position arrays grow to; capacity doubles from there
+MIN_POSITION_CAPACITY = 16
+
+# The one trade insert statement, compiled once and kept in sqlite3's statement cache
+_INSERT_TRADE_SQL = "INSERT INTO trades (id, symbol, side, size, entry, close, net_pnl) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+def _update_pnl(
+    notional: np.ndarray,
+    size: np.ndarray,
+    side_mult: np.ndarray,
+    open_fee: np.ndarray,
+    size_taker: np.ndarray,
+    mark: float,
+    out_pnl: np.ndarray,
+    out_net: np.ndarray,
+) -> None:
+    """Write pnl and net pnl at *mark* for every position into the output buffers."""
+    # pnl = (mark * size - entry * size) * side_mult, entry notional precomputed at open
+    np.multiply(size, mark, out=out_pnl)
+    out_pnl -= notional
+    out_pnl *= side_mult
+    # Net PnL after opening and closing fees; closing fee = mark * (size * taker rate, precomputed)
+    np.multiply(size_taker, -mark, out=out_net)
+    out_net += out_pnl
+    out_net -= open_fee
+
+
+@dataclass(slots=True)
+class Position:
+    """An open position. Derived fields are fixed when the position is opened."""
+    id: str
+    symbol: str
+    side: str
+    side_mult: int  # +1 for BUY, -1 for SELL
+    size: float
+    entry: float
+    breakeven: float
+    open_fee: float
+    maker_fee_rate: float
+    taker_fee_rate: float
+    pnl: float = 0.0
+    net_pnl: float = 0.0
+    liquidation: str = "-"
+    # Products used when the position closes, derived from the fields above
+    size_signed: float = field(init=False)  # size * side_mult
+    maker_rate_times_size: float = field(init=False)
+    taker_rate_times_size: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.size_signed = self.size * self.side_mult
+        self.maker_rate_times_size = self.size * self.maker_fee_rate
+        self.taker_rate_times_size = self.size * self.taker_fee_rate
+
 
 class TradesService:
     def __init__(self) -> None:
         self.binance = BinanceService()
         # State
-        self.positions: List[Dict] = []  # open positions
+        self.positions: Dict[str, Position] = {}  # open positions, keyed by id
         self.history: List[Dict] = []    # closed positions
-        self.orders: List[Dict] = []     # limit orders waiting
+        self.orders: Dict[str, Dict] = {}  # limit orders waiting, keyed by id
         self.current_symbol = "BTCUSDT"  # Default to BTCUSDT
         
         # Default fees (will be overridden per symbol when orders are created)
@@ -17,14 +80,46 @@ class TradesService:
         self.fee_rate_taker: float = 0.0004  # 0.04%
         
         self._id_counter = 1
+        # Every id handed out so far (history, positions, orders), for collision checks
+        self._used_ids: set[str] = set()
+
+        # Struct-of-arrays mirror of self.positions, used for the per-tick PnL math.
+        # Only the first _pos_count slots are live; spare capacity makes opening a position O(1).
+        self._pos_count = 0
+        self._pos_notional = np.empty(0, dtype=np.float64)  # entry * size
+        self._pos_size = np.empty(0, dtype=np.float64)
+        self._pos_side_mult = np.empty(0, dtype=np.int8)
+        self._pos_open_fee = np.empty(0, dtype=np.float64)
+        self._pos_size_taker = np.empty(0, dtype=np.float64)  # size * taker fee rate
+        self._pos_pnl = np.empty(0, dtype=np.float64)
+        self._pos_net_pnl = np.empty(0, dtype=np.float64)
+        # Mark price the current PnL figures were computed at; None forces a recompute
+        self._pnl_mark: Optional[float] = None
+        # Pending orders indexed by limit price ({limit_price: {order_id: order}}) per side,
+        # so a tick only visits the price levels it actually triggers
+        self._buy_orders = SortedDict()
+        self._sell_orders = SortedDict()
         
-        # Database setup
-        self.db_conn = sqlite3.connect("trades.db")
+        # Database setup. Autocommit mode (isolation_level=None): single statements commit
+        # on their own and batches open explicit transactions. Inserts run in worker threads
+        # (see _insert_trades), so the same-thread check is off and _db_lock serialises access.
+        self.db_conn = sqlite3.connect(
+            "trades.db", isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        self._db_lock = threading.Lock()
+        # Closed trades waiting for a worker thread to insert them; close() flushes what is left
+        self._pending_trades: deque = deque()
+        self._db_closed = False
         self._prepare_database()
         self._load_history_from_db()
 
     def _prepare_database(self) -> None:
         cur = self.db_conn.cursor()
+        # WAL with synchronous=NORMAL avoids an fsync per committed trade
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA cache_size=-8000")  # ~8 MB page cache
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS trades (
@@ -39,74 +134,184 @@ class TradesService:
             )
             """
         )
-        self.db_conn.commit()
+        # Lets the ordered history load read rows in index order instead of sorting
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(ts)")
+        # Long-lived cursor for trade inserts
+        self._insert_cur = self.db_conn.cursor()
 
     def _load_history_from_db(self) -> None:
-        cur = self.db_conn.cursor()
-        for row in cur.execute("SELECT id,symbol,side,size,entry,close,net_pnl FROM trades ORDER BY ts"):
-            self.history.append({
-                "id": row[0],
-                "symbol": row[1],
-                "side": row[2],
-                "size": row[3],
-                "entry": row[4],
-                "close": row[5],
-                "net_pnl": row[6],
-            })
+        rows = self.db_conn.execute(
+            "SELECT id,symbol,side,size,entry,close,net_pnl FROM trades ORDER BY ts"
+        ).fetchall()
+        self._used_ids.update(row[0] for row in rows)
+        self.history = [
+            {
+                "id": trade_id,
+                "symbol": symbol,
+                "side": side,
+                "size": size,
+                "entry": entry,
+                "close": close,
+                "net_pnl": net_pnl,
+            }
+            for trade_id, symbol, side, size, entry, close, net_pnl in rows
+        ]
 
     def _next_id(self, symbol: str) -> str:
         # Generate a unique 6-digit hexadecimal hash (24-bit randomness)
-        # Keep trying until we get an id that isn't already in use
-        existing_ids = {
-            *(row["id"] for row in self.history),
-            *(p["id"] for p in self.positions),
-            *(o["id"] for o in self.orders),
-        }
-
+        # Ids are local identifiers, not secrets, so the fast non-cryptographic PRNG is enough
+        # Keep trying until we get an id that hasn't been handed out before
         while True:
-            rand_hash = secrets.token_hex(3)  # 6 hex chars
+            rand_hash = f"{random.getrandbits(24):06x}"  # 6 hex chars
             candidate = f"{symbol}-{rand_hash}"
-            if candidate not in existing_ids:
+            if candidate not in self._used_ids:
+                self._used_ids.add(candidate)
                 return candidate
 
-    def _insert_trade(self, trade: Dict) -> None:
-        cur = self.db_conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO trades (id, symbol, side, size, entry, close, net_pnl)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                trade["id"],
-                trade["symbol"],
-                trade["side"],
-                trade["size"],
-                trade["entry"],
-                trade["close"],
-                trade["net_pnl"],
-            ),
-        )
-        self.db_conn.commit()
+    async def _insert_trades(self, trades: List[Dict]) -> None:
+        """Persist several closed trades in a single transaction, off the event loop."""
+        self._pending_trades.extend(trades)
+        await asyncio.to_thread(self._write_pending_trades)
+
+    def _write_pending_trades(self) -> None:
+        with self._db_lock:
+            # close() may already have flushed the queue and closed the connection
+            if not self._db_closed:
+                self._flush_pending_trades()
+
+    def _flush_pending_trades(self) -> None:
+        """Insert every queued trade in one transaction; the caller holds _db_lock."""
+        pending = self._pending_trades
+        batch = []
+        while pending:
+            batch.append(pending.popleft())
+        if not batch:
+            return
+        rows = [
+            (t["id"], t["symbol"], t["side"], t["size"], t["entry"], t["close"], t["net_pnl"])
+            for t in batch
+        ]
+        cur = self._insert_cur
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.executemany(_INSERT_TRADE_SQL, rows)
+        except BaseException:
+            cur.execute("ROLLBACK")
+            # Keep the trades queued so the next insert or close() retries them
+            pending.extendleft(reversed(batch))
+            raise
+        cur.execute("COMMIT")
+
+    def _append_position_arrays(self, pos: Position) -> None:
+        """Add a newly opened position to the arrays, doubling their capacity when full."""
+        n = self._pos_count
+        if n == len(self._pos_size):
+            capacity = max(2 * n, MIN_POSITION_CAPACITY)
+            for name in (
+                "_pos_notional",
+                "_pos_size",
+                "_pos_side_mult",
+                "_pos_open_fee",
+                "_pos_size_taker",
+                "_pos_pnl",
+                "_pos_net_pnl",
+            ):
+                old = getattr(self, name)
+                grown = np.empty(capacity, dtype=old.dtype)
+                grown[:n] = old[:n]
+                setattr(self, name, grown)
+        self._pos_notional[n] = pos.entry * pos.size
+        self._pos_size[n] = pos.size
+        self._pos_side_mult[n] = pos.side_mult
+        self._pos_open_fee[n] = pos.open_fee
+        self._pos_size_taker[n] = pos.taker_rate_times_size
+        self._pos_count = n + 1
+        self._pnl_mark = None
+
+    def _sync_position_arrays(self) -> None:
+        """Rebuild the position arrays after positions were removed."""
+        positions = self.positions.values()
+        n = len(positions)
+        entry = np.fromiter((p.entry for p in positions), dtype=np.float64, count=n)
+        self._pos_size = np.fromiter((p.size for p in positions), dtype=np.float64, count=n)
+        self._pos_notional = entry * self._pos_size
+        self._pos_side_mult = np.fromiter((p.side_mult for p in positions), dtype=np.int8, count=n)
+        self._pos_open_fee = np.fromiter((p.open_fee for p in positions), dtype=np.float64, count=n)
+        self._pos_size_taker = np.fromiter((p.taker_rate_times_size for p in positions), dtype=np.float64, count=n)
+        self._pos_pnl = np.empty(n, dtype=np.float64)
+        self._pos_net_pnl = np.empty(n, dtype=np.float64)
+        self._pos_count = n
+        self._pnl_mark = None
+
+    def _index_order(self, order: Dict) -> None:
+        """Add *order* to the price index of its side."""
+        index = self._buy_orders if order["side"] == "BUY" else self._sell_orders
+        level = index.get(order["limit_price"])
+        if level is None:
+            level = index[order["limit_price"]] = {}
+        level[order["id"]] = order
+
+    def _unindex_order(self, order: Dict) -> None:
+        """Remove *order* from the price index, dropping its price level once empty."""
+        index = self._buy_orders if order["side"] == "BUY" else self._sell_orders
+        level = index.get(order["limit_price"])
+        if level is not None and level.pop(order["id"], None) is not None and not level:
+            del index[order["limit_price"]]
 
     async def get_top_symbols(self, limit: int = 30) -> List[str]:
         """Retrieve top USDT pairs."""
         return await self.binance.get_top_usdt_pairs(limit=limit)
 
+    async def warm_up(self) -> None:
+        """Prefetch commission rates for the current symbol so the first order skips the lookup."""
+        await self.binance.get_symbol_commission_rates(self.current_symbol)
+
     async def get_current_prices(self) -> Tuple[str, str]:
         """Get current last and mark prices for the current symbol."""
         return await self.binance.get_symbol_prices(self.current_symbol)
 
+    async def stream_current_prices(self) -> None:
+        """Stream prices for the current symbol so get_current_prices can skip REST polling."""
+        await self.binance.stream_prices(self.current_symbol)
+
+    def close(self) -> None:
+        """Stop the price stream and close the database."""
+        self.binance.close()
+        # Waits for an insert still running in a worker thread, then writes any trades whose
+        # worker has not started yet; those workers see _db_closed and do nothing
+        with self._db_lock:
+            try:
+                self._flush_pending_trades()
+            finally:
+                self._db_closed = True
+                # Refresh query planner statistics where SQLite thinks they are stale
+                self.db_conn.execute("PRAGMA optimize")
+                self.db_conn.close()
+
     def set_current_symbol(self, symbol: str) -> None:
         """Update the current trading symbol."""
         self.current_symbol = symbol
+        self._pnl_mark = None
 
     def get_current_symbol(self) -> str:
         """Get the current trading symbol."""
         return self.current_symbol
 
-    def get_positions(self) -> List[Dict]:
+    def get_positions(self) -> List[Position]:
         """Get all open positions."""
-        return self.positions
+        return list(self.positions.values())
+
+    def get_position(self, position_id: str) -> Optional[Position]:
+        """Get an open position by id."""
+        return self.positions.get(position_id)
+
+    def position_count(self) -> int:
+        """Number of open positions."""
+        return len(self.positions)
+
+    def order_count(self) -> int:
+        """Number of pending limit orders."""
+        return len(self.orders)
 
     def get_history(self) -> List[Dict]:
         """Get trade history."""
@@ -114,9 +319,9 @@ class TradesService:
 
     def get_orders(self) -> List[Dict]:
         """Get all pending limit orders."""
-        return self.orders
+        return list(self.orders.values())
 
-    async def submit_market_order(self, symbol: str, side: str, size: float, price: Optional[float] = None) -> Dict:
+    async def submit_market_order(self, symbol: str, side: str, size: float, price: Optional[float] = None) -> Position:
         """Submit a new market order."""
         if price is None:
             # fetch current mark price
@@ -132,22 +337,24 @@ class TradesService:
         pos_id = self._next_id(symbol)
         open_fee = price * size * taker_fee_rate
 
-        position = {
-            "id": pos_id,
-            "symbol": symbol,
-            "side": side,
-            "size": size,
-            "entry": price,
-            "liquidation": "-",
-            "breakeven": price * (1 + maker_fee_rate*2) if side == "BUY" else price * (1 - maker_fee_rate*2),
-            "open_fee": open_fee,
-            "pnl": 0,
-            "net_pnl": -open_fee,
-            "maker_fee_rate": maker_fee_rate,
-            "taker_fee_rate": taker_fee_rate,
-        }
+        side_mult = 1 if side == "BUY" else -1
+
+        position = Position(
+            id=pos_id,
+            symbol=symbol,
+            side=side,
+            side_mult=side_mult,
+            size=size,
+            entry=price,
+            breakeven=price * (1 + side_mult * maker_fee_rate * 2),
+            open_fee=open_fee,
+            net_pnl=-open_fee,
+            maker_fee_rate=maker_fee_rate,
+            taker_fee_rate=taker_fee_rate,
+        )
 
-        self.positions.append(position)
+        self.positions[pos_id] = position
+        self._append_position_arrays(position)
         return position
 
     def submit_limit_order(self, symbol: str, side: str, size: float, limit_price: float, position_id: Optional[str] = None) -> Dict:
@@ -163,119 +370,170 @@ class TradesService:
         if position_id:
             order["position_id"] = position_id
 
-        self.orders.append(order)
+        replaced = self.orders.get(order_id)
+        if replaced is not None:
+            # A new exit order for the same position supersedes the previous one
+            self._unindex_order(replaced)
+        self.orders[order_id] = order
+        self._index_order(order)
         return order
 
     def cancel_order(self, order_id: str) -> None:
         """Cancel a pending limit order."""
-        self.orders = [o for o in self.orders if o["id"] != order_id]
-
-    async def update_positions_pnl(self, mark_price: float) -> None:
-        """Update PnL calculations for all open positions."""
-        for pos in self.positions:
-            side_mult = 1 if pos["side"] == "BUY" else -1
-            pos["pnl"] = (mark_price - pos["entry"]) * float(pos["size"]) * side_mult
-            # Net PnL after closing fee
-            open_fee = pos["open_fee"]
-            taker_fee_rate = pos.get("taker_fee_rate", self.fee_rate_taker)
-            close_fee = mark_price * float(pos["size"]) * taker_fee_rate
-            pos["net_pnl"] = pos["pnl"] - open_fee - close_fee
+        order = self.orders.pop(order_id, None)
+        if order is not None:
+            self._unindex_order(order)
+
+    async def update_positions_pnl(self, mark_price: float) -> bool:
+        """Update PnL calculations for all open positions.
+
+        Returns False without recomputing when neither the mark price, the
+        symbol nor the set of open positions changed since the last update.
+        """
+        if not self.positions or mark_price == self._pnl_mark:
+            return False
+        self._pnl_mark = mark_price
+
+        # Hold on to the live slices: positions may open or close while the kernel runs in a thread
+        n = self._pos_count
+        positions = list(self.positions.values())
+        out_pnl, out_net = self._pos_pnl[:n], self._pos_net_pnl[:n]
+        args = (
+            self._pos_notional[:n],
+            self._pos_size[:n],
+            self._pos_side_mult[:n],
+            self._pos_open_fee[:n],
+            self._pos_size_taker[:n],
+            mark_price,
+            out_pnl,
+            out_net,
+        )
+        if len(positions) >= PNL_THREAD_THRESHOLD:
+            await asyncio.to_thread(_update_pnl, *args)
+        else:
+            _update_pnl(*args)
+
+        for pos, pos_pnl, pos_net_pnl in zip(positions, out_pnl.tolist(), out_net.tolist()):
+            pos.pnl = pos_pnl
+            pos.net_pnl = pos_net_pnl
+        return True
 
     async def check_and_fill_limit_orders(self, last_price: float) -> List[Dict]:
-        """Check if any limit orders should be filled at the current price."""
-        filled: List[Dict] = []
-        for o in self.orders:
-            trigger = (last_price <= o["limit_price"] if o["side"] == "BUY" else last_price >= o["limit_price"])
-            if trigger:
-                filled.append(o)
+        """Check if any limit orders should be filled at the current price.
+
+        Returns the orders that opened or closed a position.
+        """
+        if not self.orders:
+            return []
+
+        # BUY orders fill at or below their limit, SELL orders at or above it
+        filled: List[Dict] = [
+            o
+            for price in self._buy_orders.irange(minimum=last_price)
+            for o in self._buy_orders[price].values()
+        ]
+        filled.extend(
+            o
+            for price in self._sell_orders.irange(maximum=last_price)
+            for o in self._sell_orders[price].values()
+        )
+        # Take every triggered order off the book before awaiting anything below
+        for o in filled:
+            del self.orders[o["id"]]
+            self._unindex_order(o)
 
+        closed_trades: List[Dict] = []
+        executed: List[Dict] = []  # filled orders that actually opened or closed a position
         for o in filled:
-            self.orders.remove(o)
             if "position_id" in o:
                 # Exit order: close matching position
-                pos = next((p for p in self.positions if p["id"] == o["position_id"]), None)
+                pos = self.positions.pop(o["position_id"], None)
                 if not pos:
-                    continue
-                side_mult = 1 if pos["side"] == "BUY" else -1
-                pnl = (o["limit_price"] - pos["entry"]) * pos["size"] * side_mult
-                maker_fee_rate = pos.get("maker_fee_rate", self.fee_rate_maker)
-                exit_fee = o["limit_price"] * pos["size"] * maker_fee_rate
-                net_pnl = pnl - pos["open_fee"] - exit_fee
+                    continue  # its position is already gone; the order is simply dropped
+                pnl = (o["limit_price"] - pos.entry) * pos.size_signed
+                exit_fee = o["limit_price"] * pos.maker_rate_times_size
+                net_pnl = pnl - pos.open_fee - exit_fee
                 closed = {
-                    "id": pos["id"],
-                    "symbol": pos["symbol"],
-                    "side": pos["side"],
-                    "size": pos["size"],
-                    "entry": pos["entry"],
+                    "id": pos.id,
+                    "symbol": pos.symbol,
+                    "side": pos.side,
+                    "size": pos.size,
+                    "entry": pos.entry,
                     "close": o["limit_price"],
                     "net_pnl": net_pnl,
                 }
-                self.positions = [p for p in self.positions if p["id"] != pos["id"]]
                 self.history.append(closed)
-                self._insert_trade(closed)
+                closed_trades.append(closed)
+                executed.append(o)
             else:
                 # Regular entry limit order becomes active position
                 pos_id = o["id"]
                 # Fetch commission rates for this symbol (maker fee applies here)
                 maker_fee_rate, taker_fee_rate = await self.binance.get_symbol_commission_rates(o["symbol"])
                 open_fee = o["limit_price"] * o["size"] * maker_fee_rate
-                pos = {
-                    "id": pos_id,
-                    "symbol": o["symbol"],
-                    "side": o["side"],
-                    "size": o["size"],
-                    "entry": o["limit_price"],
-                    "liquidation": "-",
-                    "breakeven": o["limit_price"] * (1 + maker_fee_rate*2) if o["side"] == "BUY" else o["limit_price"] * (1 - maker_fee_rate*2),
-                    "open_fee": open_fee,
-                    "pnl": 0,
-                    "net_pnl": - open_fee,
-                    "maker_fee_rate": maker_fee_rate,
-                    "taker_fee_rate": taker_fee_rate,
-                }
-                self.positions.append(pos)
-
-        return filled 
+                side_mult = 1 if o["side"] == "BUY" else -1
+                pos = Position(
+                    id=pos_id,
+                    symbol=o["symbol"],
+                    side=o["side"],
+                    side_mult=side_mult,
+                    size=o["size"],
+                    entry=o["limit_price"],
+                    breakeven=o["limit_price"] * (1 + side_mult * maker_fee_rate * 2),
+                    open_fee=open_fee,
+                    net_pnl=-open_fee,
+                    maker_fee_rate=maker_fee_rate,
+                    taker_fee_rate=taker_fee_rate,
+                )
+                self.positions[pos_id] = pos
+                self._append_position_arrays(pos)
+                executed.append(o)
+
+        if closed_trades:
+            self._sync_position_arrays()
+            await self._insert_trades(closed_trades)
+
+        return executed 
 
     async def close_position_market(self, position_id: str) -> Optional[Dict]:
         """Close a position at current market price and return the closed trade dict."""
-        pos = next((p for p in self.positions if p["id"] == position_id), None)
+        pos = self.positions.get(position_id)
         if not pos:
             return None
 
         # Fetch current market price
-        _, mark = await self.binance.get_symbol_prices(pos["symbol"])
+        _, mark = await self.binance.get_symbol_prices(pos.symbol)
         try:
             mark_f = float(mark)
         except ValueError:
             # Can't close because price is invalid
             return None
 
-        side_mult = 1 if pos["side"] == "BUY" else -1
-        pnl = (mark_f - pos["entry"]) * pos["size"] * side_mult
-        open_fee = pos["open_fee"]
-        taker_fee_rate = pos.get("taker_fee_rate", self.fee_rate_taker)
-        close_fee = mark_f * pos["size"] * taker_fee_rate
-        net_pnl = pnl - open_fee - close_fee
+        pnl = (mark_f - pos.entry) * pos.size_signed
+        close_fee = mark_f * pos.taker_rate_times_size
+        net_pnl = pnl - pos.open_fee - close_fee
 
         closed = {
-            "id": pos["id"],
-            "symbol": pos["symbol"],
-            "side": pos["side"],
-            "size": pos["size"],
-            "entry": pos["entry"],
+            "id": pos.id,
+            "symbol": pos.symbol,
+            "side": pos.side,
+            "size": pos.size,
+            "entry": pos.entry,
             "close": mark_f,
             "net_pnl": net_pnl,
         }
 
         # Remove position
-        self.positions = [p for p in self.positions if p["id"] != position_id]
+        if self.positions.pop(position_id, None) is None:
+            return None  # closed elsewhere while the price was being fetched
+        self._sync_position_arrays()
+        # Remove any linked exit order before awaiting, so a tick cannot fill it meanwhile
+        exit_order = self.orders.pop(f"{position_id}-exit", None)
+        if exit_order is not None:
+            self._unindex_order(exit_order)
         # Add to history
         self.history.append(closed)
         # Persist
-        self._insert_trade(closed)
-
-        # Remove any linked exit orders
-        self.orders = [o for o in self.orders if o.get("position_id") != position_id]
+        await self._insert_trades([closed])
 
         return closed 
\ No newline at end of file
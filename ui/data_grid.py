@@ -5,8 +5,14 @@ class DataGrid(Static):
     def __init__(self, **kwargs):
         super().__init__(markup=True, **kwargs)
         self._data: dict[str, dict[str, str]] = {}
+        # (key, value) pairs of the last rendered data, to skip identical updates
+        self._last_key: tuple[tuple[str, str], ...] | None = None
 
     def update_data(self, data: dict[str, dict[str, str]]) -> None:
+        key = tuple((k, v["value"]) for k, v in data.items())
+        if key == self._last_key:
+            return
+        self._last_key = key
         self._data = data
         lines = [
             f"[b]{k}[/b]\n{v['value']}\n"
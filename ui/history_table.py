@@ -14,23 +14,36 @@ class HistoryTable(DataTable):
             "Close",
             "Net PnL",
         )
+        # Number of history entries already shown; history is append-only
+        self._row_count = 0
+
+    def clear_history(self) -> None:
+        """Remove every row, e.g. after the underlying history was cleared."""
+        self.clear()
+        self._row_count = 0
 
     def update_history(self, history: list[dict]) -> None:
         """Update table rows based on *history* list.
 
         Each dict in *history* should contain keys:
         symbol, side, size, entry, close, net_pnl
+
+        Closed trades never change, so only entries past the ones already
+        shown are added.
         """
-        existing_keys = {row.key for row in self.rows.values()}
+        if len(history) < self._row_count:
+            # History shrank (cleared); rebuild from scratch
+            self.clear_history()
 
         # TODO: refactor this
         def fmt(x):
             return f"{x:,.2f}" if isinstance(x, (int, float)) else x
 
-        for idx, h in enumerate(history):
+        for idx in range(self._row_count, len(history)):
+            h = history[idx]
             row_key = f"hist-{idx}"  # stable key per history order
             pnl_colour = "green" if h["net_pnl"] >= 0 else "red"
-            row_values = [
+            self.add_row(
                 h.get("id", ""),
                 h["symbol"],
                 h["side"],
@@ -38,16 +51,6 @@ class HistoryTable(DataTable):
                 fmt(h["entry"]),
                 fmt(h["close"]),
                 f"[{pnl_colour}]{fmt(h['net_pnl'])}[/{pnl_colour}]",
-            ]
-
-            if row_key in existing_keys:
-                for col_key, value in zip(self.columns.keys(), row_values):
-                    self.update_cell(row_key, col_key, value)
-            else:
-                self.add_row(*row_values, key=row_key)
-
-        # Remove rows that are no longer in history (after, e.g., clearing)
-        for key in list(existing_keys):
-            if key not in {f"hist-{idx}" for idx in range(len(history))}:
-                self.remove_row(key) 
- 
\ No newline at end of file
+                key=row_key,
+            )
+        self._row_count = len(history)
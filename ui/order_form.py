@@ -8,21 +8,20 @@ class OrderForm(Vertical):
     class Submit(Message):
         """Posted when the user presses the *Submit* button.
 
-        Contains symbol, side, price, and quantity information for an order.
+        Contains symbol, side, limit price (``None`` for market) and size in
+        base asset units; USDT quantities are converted by the form.
         """
         def __init__(
             self,
             symbol: str,
             side: str,
-            price: str | None,
-            qty: str,
-            qty_mode: str,
+            price: float | None,
+            size: float,
         ) -> None:
             self.symbol = symbol.upper()
             self.side = side.upper()
             self.price = price
-            self.qty = qty
-            self.qty_mode = qty_mode  # base asset name or "USDT"
+            self.size = size
             super().__init__()
 
     def compose(self):
@@ -48,6 +47,9 @@ class OrderForm(Vertical):
         )
 
         self.qty_mode = "COIN"  # default (base asset)
+        self.mark_price: float | None = None  # latest mark, used to size USDT market orders
+        # (symbols, current) last applied by update_symbols
+        self._last_symbols_sig: tuple[tuple[str, ...], str | None] | None = None
 
         yield Horizontal(
             Button("Buy", id="buy", variant="success"),
@@ -68,18 +70,49 @@ class OrderForm(Vertical):
 
         if button_id in ("buy", "sell"):
             side = "BUY" if button_id == "buy" else "SELL"
+            try:
+                price = float(self.price_input.value) if self.price_input.value else None
+                qty = float(self.qty_input.value or "0")
+            except ValueError:
+                self.log.warning("Invalid price or quantity")
+                return
+
+            if self.qty_mode == "USDT":
+                # Convert USDT amount to base asset size at the limit price, or the last mark for market orders
+                reference = price if price is not None else self.mark_price
+                if not reference:
+                    self.notify(
+                        "No mark price available yet to size a USDT order; try again in a moment "
+                        "or enter a limit price.",
+                        severity="warning",
+                    )
+                    return
+                size = qty / reference
+            else:
+                size = qty
+
             self.post_message(
                 self.Submit(
                     str(self.symbol_select.value) if self.symbol_select.value is not Select.BLANK else "",
                     side,
-                    self.price_input.value or None,
-                    self.qty_input.value or "0",
-                    self.qty_mode,
+                    price,
+                    size,
                 )
             )
 
+    def set_mark_price(self, mark: float | None) -> None:
+        """Remember the latest mark price for sizing USDT market orders."""
+        self.mark_price = mark
+
     # Public helper to refresh symbol options
-    def update_symbols(self, symbols: list[str], current: str | None = None) -> None:
+    def update_symbols(self, symbols: list[str], current: str | None = None) -> bool:
+        """Refresh the symbol dropdown; returns False when list and current were already shown."""
+        # Rebuilding the dropdown is visible to the user, so skip it when nothing changed
+        sig = (tuple(symbols), current)
+        if sig == self._last_symbols_sig:
+            return False
+        self._last_symbols_sig = sig
+
         self.log.debug(f"Updating symbols list with {len(symbols)} options, current={current}")
         options = [(s, s) for s in symbols]
         self.symbol_select.set_options(options)
@@ -106,6 +139,7 @@ class OrderForm(Vertical):
         else:
             self.log.warning("No symbols provided, clearing selection")
             self.symbol_select.value = Select.BLANK
+        return True
 
     def set_coin_label_from_symbol(self, symbol: str) -> None:
         """Update coin button label based on symbol like BTCUSDT -> BTC.
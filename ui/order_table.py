@@ -5,21 +5,28 @@ class OrderTable(DataTable):
 
     def __init__(self) -> None:
         super().__init__(zebra_stripes=True)
-        self.add_columns("ID", "Symbol", "Side", "Size", "Limit Price", "Cancel")
+        self._col_keys = self.add_columns("ID", "Symbol", "Side", "Size", "Limit Price", "Cancel")
+        # Cell values last written per row key, so unchanged cells are not rewritten
+        self._last_rows: dict[str, list] = {}
 
     def update_orders(self, orders: list[dict]) -> None:
-        # Update rows in-place
-        existing = {row.key for row in self.rows.values()}
+        # Update rows in-place, touching only cells whose text changed.
+        # A re-submitted exit order keeps its id but may carry a new limit price.
+        row_ids = set()
         for o in orders:
             key = o["id"]
+            row_ids.add(key)
             size = f"{o['size']:.2f}"
             row_vals = [o["id"], o["symbol"], o["side"], size, f"{o['limit_price']:.2f}", "Cancel"]
-            if key in existing:
-                for col, val in zip(self.columns.keys(), row_vals):
-                    self.update_cell(key, col, val)
-            else:
+            last = self._last_rows.get(key)
+            if last is None:
                 self.add_row(*row_vals, key=key)
+            else:
+                for col, old, val in zip(self._col_keys, last, row_vals):
+                    if val != old:
+                        self.update_cell(key, col, val)
+            self._last_rows[key] = row_vals
         # Remove stale rows
-        for k in list(existing):
-            if k not in {o["id"] for o in orders}:
-                self.remove_row(k)
+        for k in self._last_rows.keys() - row_ids:
+            self.remove_row(k)
+            del self._last_rows[k]
@@ -5,7 +5,7 @@ class PositionTable(DataTable):
 
     def __init__(self) -> None:
         super().__init__(zebra_stripes=True)
-        self.add_columns(
+        columns = self.add_columns(
             "ID",
             "Symbol",
             "Side",
@@ -18,45 +18,82 @@ class PositionTable(DataTable):
             "Limit",
             "Close",
         )
+        self._pnl_col, self._net_pnl_col = columns[7], columns[8]
+        # ids of the rows currently shown, in order
+        self._row_ids: tuple[str, ...] = ()
+        # Cell values last written per row key, so unchanged cells are not rewritten
+        self._last_rows: dict[str, list] = {}
+        # (pnl, net_pnl) each row's PnL cells were formatted from, to skip re-formatting
+        self._last_pnl: dict[str, tuple[float, float]] = {}
 
-    def update_positions(self, positions: list[dict]) -> None:
+    def update_positions(self, positions: list) -> None:
         """Update table rows based on *positions* list.
 
-        Each dict in *positions* should contain keys:
-        symbol, side, size, entry, liquidation, breakeven, pnl, net_pnl
+        Each position in *positions* should expose attributes:
+        id, symbol, side, size, entry, liquidation, breakeven, pnl, net_pnl
+
+        Only the PnL cells of rows already shown can change. Their text is
+        re-formatted only when the underlying value moved, and written only
+        when the text changed.
         """
-        existing_keys = {row.key for row in self.rows.values()}
+        row_ids = tuple(p.id for p in positions)
+        if row_ids == self._row_ids:
+            for p in positions:
+                self._refresh_pnl_cells(p)
+            return
+
         # First add/update rows
         for p in positions:
-            row_key = p["id"]
-            pnl_colour = "green" if p["pnl"] >= 0 else "red"
-            net_colour = "green" if p["net_pnl"] >= 0 else "red"
-
-            # format numbers to 2 decimals
-            def fmt(x):
-                return f"{x:,.2f}" if isinstance(x, (int, float)) else x
-
+            if p.id in self._last_rows:
+                # Everything but the PnL columns is fixed when a position opens
+                self._refresh_pnl_cells(p)
+                continue
             row_values = [
-                p["id"],
-                p["symbol"],
-                p["side"],
-                fmt(p["size"]),
-                fmt(p["entry"]),
-                fmt(p["liquidation"]),
-                fmt(p["breakeven"]),
-                f"[{pnl_colour}]{fmt(p['pnl'])}[/{pnl_colour}]",
-                f"[{net_colour}]{fmt(p['net_pnl'])}[/{net_colour}]",
+                p.id,
+                p.symbol,
+                p.side,
+                _fmt(p.size),
+                _fmt(p.entry),
+                _fmt(p.liquidation),
+                _fmt(p.breakeven),
+                _pnl_cell(p.pnl),
+                _pnl_cell(p.net_pnl),
                 "Limit",
                 "Close",
             ]
-
-            if row_key in existing_keys:
-                for col_key, value in zip(self.columns.keys(), row_values):
-                    self.update_cell(row_key, col_key, value)
-            else:
-                self.add_row(*row_values, key=row_key)
+            self.add_row(*row_values, key=p.id)
+            self._last_rows[p.id] = row_values
+            self._last_pnl[p.id] = (p.pnl, p.net_pnl)
 
         # Remove rows that no longer exist
-        for key in list(existing_keys):
-            if key not in {p["id"] for p in positions}:
-                self.remove_row(key) 
\ No newline at end of file
+        for key in self._last_rows.keys() - set(row_ids):
+            self.remove_row(key)
+            del self._last_rows[key]
+            del self._last_pnl[key]
+
+        self._row_ids = row_ids
+
+    def _refresh_pnl_cells(self, p) -> None:
+        """Rewrite the PnL cells of an existing row whose figures changed."""
+        values = (p.pnl, p.net_pnl)
+        if values == self._last_pnl[p.id]:
+            return
+        self._last_pnl[p.id] = values
+        last = self._last_rows[p.id]
+        pnl, net_pnl = _pnl_cell(p.pnl), _pnl_cell(p.net_pnl)
+        if pnl != last[7]:
+            self.update_cell(p.id, self._pnl_col, pnl)
+            last[7] = pnl
+        if net_pnl != last[8]:
+            self.update_cell(p.id, self._net_pnl_col, net_pnl)
+            last[8] = net_pnl
+
+
+# format numbers to 2 decimals
+def _fmt(x):
+    return f"{x:,.2f}" if isinstance(x, (int, float)) else x
+
+
+def _pnl_cell(value: float) -> str:
+    colour = "green" if value >= 0 else "red"
+    return f"[{colour}]{_fmt(value)}[/{colour}]"
@@ -2,13 +2,13 @@ from .data_grid import DataGrid
 
 class PriceDisplay(DataGrid):
     """Specialised grid for last-price / mark-price."""
-    def update_prices(self, last: str, mark: str) -> None:
-        try:
-            lp, mp = float(last), float(mark)
-            colour = "green" if mp >= lp else "red"
+    def update_prices(self, last: str, mark: str, last_f: float | None, mark_f: float | None) -> None:
+        """Show *last* / *mark* as received; the parsed floats (None if not a number) pick the colours."""
+        if last_f is not None and mark_f is not None:
+            colour = "green" if mark_f >= last_f else "red"
             last_display = f"[green]{last}[/green]"
             mark_display = f"[{colour}]{mark}[/{colour}]"
-        except ValueError:          # one of the values is not a number
+        else:          # one of the values is not a number
             colour = "red"
             last_display = f"[{colour}]{last}[/{colour}]"
             mark_display = f"[{colour}]{mark}[/{colour}]"